@@ -1,60 +1,116 @@
 import time
 import random
-from typing import List, Callable, Optional
+import sqlite3
+from typing import List, Callable, Optional, Tuple, Dict
 from dataclasses import dataclass, field
-from enum import Enum
 
 
 class EventArgs:
     """Base class for event arguments"""
-    pass
+    
+    # No instance attributes, so the shared default below can't be mutated
+    __slots__ = ()
+
+
+# Shared default arguments for events invoked without args
+_EMPTY_ARGS = EventArgs()
 
 
 class Event:
     """Equivalent to C# event class"""
     
+    __slots__ = ("_handlers", "_dispatch")
+    
     def __init__(self):
         self._handlers: List[Callable] = []
+        self._dispatch: Tuple[Callable, ...] = ()
     
     def add_handler(self, handler: Callable):
         """Add event handler"""
         if handler not in self._handlers:
             self._handlers.append(handler)
+            self._dispatch = tuple(self._handlers)
     
     def remove_handler(self, handler: Callable):
         """Remove event handler"""
         if handler in self._handlers:
             self._handlers.remove(handler)
+            self._dispatch = tuple(self._handlers)
     
     def invoke(self, sender, args: EventArgs = None):
         """Invoke event"""
-        for handler in self._handlers:
-            handler(sender, args or EventArgs())
+        if args is None:
+            args = _EMPTY_ARGS
+        for handler in self._dispatch:
+            handler(sender, args)
 
 
-@dataclass
+@dataclass(slots=True)
 class KitchenObjectSO:
     """Data class for kitchen objects"""
     name: str
     object_id: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipeSO:
     """Data class for recipes"""
     name: str
     kitchen_object_so_list: List[KitchenObjectSO] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipeListSO:
     """Data class for recipe list"""
     recipe_so_list: List[RecipeSO] = field(default_factory=list)
 
 
+def _recipe_match_key(recipe_so: RecipeSO,
+                      ingredient_bits: Dict[Tuple[str, int], int]) -> Tuple[int, int]:
+    """Build the (ingredient count, ingredient mask) key used for matching
+    
+    Each distinct (name, object_id) pair is assigned the next free bit in
+    ingredient_bits, so mask size depends on how many ingredients exist,
+    not on the object_id values.
+    """
+    ingredients = recipe_so.kitchen_object_so_list
+    mask = 0
+    for kitchen_object_so in ingredients:
+        key = (kitchen_object_so.name, kitchen_object_so.object_id)
+        bit = ingredient_bits.get(key)
+        if bit is None:
+            bit = ingredient_bits[key] = len(ingredient_bits)
+        mask |= 1 << bit
+    return len(ingredients), mask
+
+
+def _plate_mask(plate_ingredients: List[KitchenObjectSO],
+                ingredient_bits: Dict[Tuple[str, int], int]) -> int:
+    """Build the ingredient mask of a plate from the recipe bit assignments"""
+    mask = 0
+    for kitchen_object_so in plate_ingredients:
+        # Ingredients no recipe uses have no bit and can't affect a match
+        bit = ingredient_bits.get((kitchen_object_so.name, kitchen_object_so.object_id))
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+def _match(plate_len: int, plate_mask: int,
+           recipe_keys: List[Tuple[int, int]]) -> int:
+    """Return the index of the first recipe matching the plate, or -1"""
+    for i, (recipe_len, recipe_mask) in enumerate(recipe_keys):
+        # Same number of ingredients and every recipe ingredient is on the plate
+        if recipe_len == plate_len and recipe_mask & ~plate_mask == 0:
+            return i
+    return -1
+
+
 class PlateKitchenObject:
     """Plate kitchen object"""
     
+    __slots__ = ("_kitchen_object_so_list",)
+    
     def __init__(self):
         self._kitchen_object_so_list: List[KitchenObjectSO] = []
     
@@ -73,7 +129,8 @@ class KitchenGameManager:
     _instance: Optional['KitchenGameManager'] = None
     
     def __init__(self):
-        self._is_game_playing = False
+        # Read directly on the per-frame path instead of through a getter
+        self.is_playing = False
     
     @classmethod
     def get_instance(cls) -> 'KitchenGameManager':
@@ -82,30 +139,27 @@ class KitchenGameManager:
             cls._instance = cls()
         return cls._instance
     
-    def is_game_playing(self) -> bool:
-        """Check if the game is in progress"""
-        return self._is_game_playing
-    
     def start_game(self):
         """Start the game"""
-        self._is_game_playing = True
+        self.is_playing = True
     
     def stop_game(self):
         """Stop the game"""
-        self._is_game_playing = False
+        self.is_playing = False
+
+
+# Parameterized so the driver binds the name and can reuse the parsed statement
+_SELECT_RECIPE_BY_NAME = "SELECT * FROM recipes WHERE name = ?"
 
 
 class DeliveryManager:
-    def get_recipe_by_name(self, user_input):
-        query = f"SELECT * FROM recipes WHERE name = '{user_input}'"
-        print(f"Executing query: {query}")
-        return query
-    
     """Delivery management class (Python version)"""
     
     _instance: Optional['DeliveryManager'] = None
     
-    def __init__(self, recipe_list_so: RecipeListSO):
+    def __init__(self, recipe_list_so: RecipeListSO,
+                 connection: Optional[sqlite3.Connection] = None,
+                 rng: Optional[random.Random] = None):
         # Event definitions
         self.on_recipe_spawned = Event()
         self.on_recipe_completed = Event()
@@ -113,80 +167,109 @@ class DeliveryManager:
         self.on_recipe_failed = Event()
         
         # Private variables
+        self._conn = connection
         self._recipe_list_so = recipe_list_so
+        # Pass a seeded rng for deterministic spawns (e.g. headless replays)
+        self._rng = rng if rng is not None else random.Random()
+        self._rng_choice = self._rng.choice
+        self._kgm = KitchenGameManager.get_instance()
         self._waiting_recipe_so_list: List[RecipeSO] = []
-        self._spawn_recipe_timer = 0.0
-        self._spawn_recipe_timer_max = 4.0
+        self._waiting_recipe_keys: List[Tuple[int, int]] = []
+        self._ingredient_bits: Dict[Tuple[str, int], int] = {}
+        self._spawn_recipe_timer_ns = 0
+        self._spawn_recipe_timer_max_ns = 4_000_000_000
         self._waiting_recipes_max = 4
         self._successful_recipes_amount = 0
-        self._last_update_time = time.time()
+        self._last_update_ns = time.monotonic_ns()
     
     @classmethod
-    def get_instance(cls, recipe_list_so: RecipeListSO = None) -> 'DeliveryManager':
+    def get_instance(cls, recipe_list_so: RecipeListSO = None,
+                     connection: Optional[sqlite3.Connection] = None,
+                     rng: Optional[random.Random] = None) -> 'DeliveryManager':
         """Get singleton instance"""
         if cls._instance is None:
             if recipe_list_so is None:
                 raise ValueError("recipe_list_so is required for first creation")
-            cls._instance = cls(recipe_list_so)
+            cls._instance = cls(recipe_list_so, connection, rng)
         return cls._instance
     
+    def get_recipe_by_name(self, user_input: str) -> List[tuple]:
+        """Look up recipe rows by name from the recipes table"""
+        if self._conn is None:
+            raise ValueError("connection is required for recipe queries")
+        cur = self._conn.cursor()
+        cur.execute(_SELECT_RECIPE_BY_NAME, (user_input,))
+        return cur.fetchall()
+    
     def update(self):
         """Frame update process (equivalent to Unity's Update)"""
-        current_time = time.time()
-        delta_time = current_time - self._last_update_time
-        self._last_update_time = current_time
+        now_ns = time.monotonic_ns()
+        delta_ns = now_ns - self._last_update_ns
+        self._last_update_ns = now_ns
         
-        self._spawn_recipe_timer -= delta_time
+        self.step(delta_ns)
+    
+    def simulate(self, frame_count: int, delta_ns: int):
+        """Advance a fixed number of frames without reading the clock"""
+        step = self.step
+        for _ in range(frame_count):
+            step(delta_ns)
+    
+    def step(self, delta_ns: int):
+        """Advance the spawn timer by delta_ns and spawn recipes for each expiry"""
+        self._spawn_recipe_timer_ns -= delta_ns
         
-        if self._spawn_recipe_timer <= 0.0:
-            self._spawn_recipe_timer = self._spawn_recipe_timer_max
+        if self._spawn_recipe_timer_ns <= 0:
+            # A long gap between frames can span several spawn periods
+            overdue_ns = -self._spawn_recipe_timer_ns
+            timer_max_ns = self._spawn_recipe_timer_max_ns
+            spawn_count = 1 + overdue_ns // timer_max_ns
+            self._spawn_recipe_timer_ns = timer_max_ns - overdue_ns % timer_max_ns
             
-            kitchen_game_manager = KitchenGameManager.get_instance()
-            if (kitchen_game_manager.is_game_playing() and 
-                len(self._waiting_recipe_so_list) < self._waiting_recipes_max):
+            if self._kgm.is_playing:
+                spawn_count = min(spawn_count,
+                                  self._waiting_recipes_max - len(self._waiting_recipe_so_list))
                 
-                # Select a recipe randomly
-                waiting_recipe_so = random.choice(self._recipe_list_so.recipe_so_list)
-                self._waiting_recipe_so_list.append(waiting_recipe_so)
+                # Read through the RecipeListSO so a reassigned recipe_so_list is used
+                recipes = self._recipe_list_so.recipe_so_list
                 
-                # Fire event
-                self.on_recipe_spawned.invoke(self)
+                for _ in range(spawn_count):
+                    # Select a recipe randomly
+                    waiting_recipe_so = self._rng_choice(recipes)
+                    self._waiting_recipe_so_list.append(waiting_recipe_so)
+                    
+                    # Build the match key at spawn so later recipe edits are picked up
+                    self._waiting_recipe_keys.append(
+                        _recipe_match_key(waiting_recipe_so, self._ingredient_bits))
+                    
+                    # Fire event
+                    self.on_recipe_spawned.invoke(self)
     
     def deliver_recipe(self, plate_kitchen_object: PlateKitchenObject):
         """Check if the recipe ingredients match the plate ingredients"""
+        plate_ingredients = plate_kitchen_object.get_kitchen_object_so_list()
+        plate_mask = _plate_mask(plate_ingredients, self._ingredient_bits)
+        
+        i = _match(len(plate_ingredients), plate_mask, self._waiting_recipe_keys)
         
-        for i, waiting_recipe_so in enumerate(self._waiting_recipe_so_list):
-            plate_ingredients = plate_kitchen_object.get_kitchen_object_so_list()
+        # If all ingredients match
+        if i >= 0:
+            self._successful_recipes_amount += 1
             
-            # Check if the number of ingredients matches
-            if len(waiting_recipe_so.kitchen_object_so_list) == len(plate_ingredients):
-                plate_contents_matches_recipe = True
-                
-                # Check each ingredient in the recipe
-                for recipe_kitchen_object_so in waiting_recipe_so.kitchen_object_so_list:
-                    ingredient_found = False
-                    
-                    # Compare with plate ingredients
-                    for plate_kitchen_object_so in plate_ingredients:
-                        if plate_kitchen_object_so == recipe_kitchen_object_so:
-                            ingredient_found = True
-                            break
-                    
-                    if not ingredient_found:
-                        plate_contents_matches_recipe = False
-                        break
-                
-                # If all ingredients match
-                if plate_contents_matches_recipe:
-                    self._successful_recipes_amount += 1
-                    self._waiting_recipe_so_list.pop(i)
-                    
-                    # Fire success events
-                    self.on_recipe_completed.invoke(self)
-                    self.on_recipe_success.invoke(self)
-                    return
+            # Waiting recipes are an unordered pool, so swap with the tail and pop
+            waiting_recipes = self._waiting_recipe_so_list
+            waiting_keys = self._waiting_recipe_keys
+            waiting_recipes[i] = waiting_recipes[-1]
+            waiting_recipes.pop()
+            waiting_keys[i] = waiting_keys[-1]
+            waiting_keys.pop()
+            
+            # Fire success events
+            self.on_recipe_completed.invoke(self)
+            self.on_recipe_success.invoke(self)
+            return
         
-    # If no matching recipe is found
+        # If no matching recipe is found
         self.on_recipe_failed.invoke(self)
     
     def get_waiting_recipe_so_list(self) -> List[RecipeSO]:
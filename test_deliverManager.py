@@ -0,0 +1,149 @@
+import random
+import unittest
+
+from deliverManager import (
+    DeliveryManager,
+    KitchenGameManager,
+    KitchenObjectSO,
+    PlateKitchenObject,
+    RecipeListSO,
+    RecipeSO,
+)
+
+SPAWN_PERIOD_NS = 4_000_000_000
+
+tomato = KitchenObjectSO("Tomato", 1)
+lettuce = KitchenObjectSO("Lettuce", 2)
+bread = KitchenObjectSO("Bread", 3)
+
+
+def make_plate(*kitchen_objects):
+    plate = PlateKitchenObject()
+    for kitchen_object in kitchen_objects:
+        plate.add_kitchen_object(kitchen_object)
+    return plate
+
+
+def baseline_matches(recipe_so, plate_ingredients):
+    """Matching rule of the original nested-loop deliver_recipe"""
+    if len(recipe_so.kitchen_object_so_list) != len(plate_ingredients):
+        return False
+    return all(o in plate_ingredients for o in recipe_so.kitchen_object_so_list)
+
+
+class DeliveryManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        KitchenGameManager.get_instance().start_game()
+        self.addCleanup(KitchenGameManager.get_instance().stop_game)
+
+    def make_manager(self, *recipes, seed=0):
+        return DeliveryManager(RecipeListSO(list(recipes)), rng=random.Random(seed))
+
+    def deliver(self, manager, plate):
+        """Deliver plate and return True on success"""
+        results = []
+        manager.on_recipe_success.add_handler(lambda sender, args: results.append(True))
+        manager.on_recipe_failed.add_handler(lambda sender, args: results.append(False))
+        manager.deliver_recipe(plate)
+        return results == [True]
+
+
+class TestSpawning(DeliveryManagerTestCase):
+    def test_catch_up_spawns_every_overdue_period(self):
+        manager = self.make_manager(RecipeSO("Salad", [lettuce, tomato]))
+        spawned = []
+        manager.on_recipe_spawned.add_handler(lambda sender, args: spawned.append(1))
+
+        # Periods expire at 0s, 4s and 8s; the next one expires at 12s
+        manager.step(9_000_000_000)
+        self.assertEqual(len(spawned), 3)
+        self.assertEqual(len(manager.get_waiting_recipe_so_list()), 3)
+
+        manager.step(2_999_999_999)
+        self.assertEqual(len(spawned), 3)
+        manager.step(1)
+        self.assertEqual(len(spawned), 4)
+
+    def test_simulate_spawns_once_per_period(self):
+        manager = self.make_manager(RecipeSO("Salad", [lettuce, tomato]))
+
+        # 100ms frames for 10s: spawns at 0s, 4s and 8s
+        manager.simulate(100, 100_000_000)
+        self.assertEqual(len(manager.get_waiting_recipe_so_list()), 3)
+
+    def test_catch_up_is_capped_by_waiting_recipes_max(self):
+        manager = self.make_manager(RecipeSO("Salad", [lettuce, tomato]))
+
+        manager.step(100 * SPAWN_PERIOD_NS)
+        self.assertEqual(len(manager.get_waiting_recipe_so_list()), 4)
+
+        manager.step(SPAWN_PERIOD_NS)
+        self.assertEqual(len(manager.get_waiting_recipe_so_list()), 4)
+
+    def test_no_spawns_while_game_stopped(self):
+        manager = self.make_manager(RecipeSO("Salad", [lettuce, tomato]))
+        KitchenGameManager.get_instance().stop_game()
+
+        manager.simulate(10, SPAWN_PERIOD_NS)
+        self.assertEqual(manager.get_waiting_recipe_so_list(), [])
+
+    def test_seeded_rng_gives_deterministic_spawns(self):
+        recipes = [RecipeSO(str(i), [KitchenObjectSO(str(i), i)]) for i in range(10)]
+
+        def spawn_names(seed):
+            manager = self.make_manager(*recipes, seed=seed)
+            manager.simulate(4, SPAWN_PERIOD_NS)
+            return [r.name for r in manager.get_waiting_recipe_so_list()]
+
+        self.assertEqual(spawn_names(42), spawn_names(42))
+
+
+class TestDelivery(DeliveryManagerTestCase):
+    def test_matching_plate_is_delivered(self):
+        manager = self.make_manager(RecipeSO("Sandwich", [bread, lettuce, tomato]))
+        manager.step(1)
+
+        self.assertTrue(self.deliver(manager, make_plate(tomato, bread, lettuce)))
+        self.assertEqual(manager.get_waiting_recipe_so_list(), [])
+        self.assertEqual(manager.get_successful_recipes_amount(), 1)
+
+    def test_mismatched_plates_fail(self):
+        manager = self.make_manager(RecipeSO("Sandwich", [bread, lettuce, tomato]))
+        manager.step(1)
+
+        self.assertFalse(self.deliver(manager, make_plate(bread, lettuce)))
+        self.assertFalse(self.deliver(manager, make_plate(bread, lettuce, lettuce)))
+        self.assertFalse(self.deliver(manager, make_plate(bread, lettuce, KitchenObjectSO("Onion", 4))))
+        self.assertEqual(len(manager.get_waiting_recipe_so_list()), 1)
+
+    def test_same_object_id_with_different_name_does_not_match(self):
+        manager = self.make_manager(RecipeSO("Salad", [tomato]))
+        manager.step(1)
+
+        self.assertFalse(self.deliver(manager, make_plate(KitchenObjectSO("Cucumber", 1))))
+
+    def test_negative_and_large_object_ids(self):
+        odd = KitchenObjectSO("Odd", -5)
+        big = KitchenObjectSO("Big", 10**9)
+        manager = self.make_manager(RecipeSO("Odd", [odd, big]))
+        manager.step(1)
+
+        self.assertTrue(self.deliver(manager, make_plate(big, odd)))
+
+    def test_matches_baseline_rule(self):
+        rng = random.Random(1234)
+        pool = [KitchenObjectSO(f"Item{i}", i % 4) for i in range(6)]
+
+        for _ in range(2000):
+            recipe_so = RecipeSO("Recipe", rng.choices(pool, k=rng.randint(0, 4)))
+            plate_ingredients = rng.choices(pool, k=rng.randint(0, 4))
+            manager = self.make_manager(recipe_so)
+            manager.step(1)
+
+            delivered = self.deliver(manager, make_plate(*plate_ingredients))
+            self.assertEqual(delivered, baseline_matches(recipe_so, plate_ingredients),
+                             (recipe_so, plate_ingredients))
+
+
+if __name__ == "__main__":
+    unittest.main()